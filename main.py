@@ -6,7 +6,11 @@ import fitz
 import io
 import re
 import os
+import sys
 import tempfile
+import time
+import cProfile
+import tracemalloc
 from groq import Groq
 from dotenv import load_dotenv
 
@@ -15,6 +19,10 @@ client = Groq(api_key=os.getenv("GROQ_API_KEY"))        # ← put your key in en
 # Model `llama-3.1-70b-versatile` has been decommissioned.
 # Allow overriding via env var and fall back to a currently supported model.
 GROQ_MODEL = os.getenv("GROQ_MODEL", "llama-3.1-8b-instant")
+# Profiling mode: wrap each request in cProfile + tracemalloc and dump the
+# results next to the generated DOCX. Enable with RESUME_PROFILE=1 or `--profile`.
+PROFILE_ENABLED = os.getenv("RESUME_PROFILE", "").strip().lower() in ("1", "true", "yes", "on") or "--profile" in sys.argv
+PROFILE_TOP_N = int(os.getenv("RESUME_PROFILE_TOP_N", "25"))
 
 
 def read_any_resume(file):
@@ -157,13 +165,33 @@ def generate_summary_from_resume(text, experience_data, education_data, skills_d
         # If generation fails, return empty string
         return ""
 
-def apply_ATS_template(template_bytes, data):
+def apply_ATS_template(template_bytes, data, timings=None):
+    """
+    Fill the template with the extracted data and return the new DOCX bytes.
+
+    If a `timings` dict is passed, the wall-clock seconds spent in each
+    section (header, summary, portfolio, skill_matrix, education,
+    experience, save) are recorded into it.
+    """
+    if timings is None:
+        timings = {}
+    last = time.perf_counter()
+
+    # Record the time elapsed since the previous section finished
+    def _lap(section):
+        nonlocal last
+        now = time.perf_counter()
+        timings[section] = timings.get(section, 0.0) + (now - last)
+        last = now
+
     doc = Document(io.BytesIO(template_bytes))
 
     # === 1. Header (Name + contact line) ===
     doc.paragraphs[0].runs[0].text = data["name"]
     doc.paragraphs[1].runs[0].text = f"{data['location']} | Email: {data['email']} | Phone {data['phone']}"
 
+    _lap("header")
+
     # === 2. Summary ===
     summary_idx = None
     for i, p in enumerate(doc.paragraphs):
@@ -215,6 +243,8 @@ def apply_ATS_template(template_bytes, data):
                         run.font.size = Pt(10)
                     insert_pos += 1
 
+    _lap("summary")
+
     # === 3. Portfolio links ===
     portfolio_idx = None
     for i, p in enumerate(doc.paragraphs):
@@ -263,6 +293,8 @@ def apply_ATS_template(template_bytes, data):
         if data.get("github"):
             _insert_after_portfolio(f"GitHub: {data['github']}")
 
+    _lap("portfolio")
+
     # === 4. Skill Matrix ===
     # Use LLM to analyze resume and create appropriate skill category headers
     # Then generate descriptive bullet points for each category
@@ -525,6 +557,8 @@ def apply_ATS_template(template_bytes, data):
             # If generation fails, fall back to simple skill list
             pass
 
+    _lap("skill_matrix")
+
     # === 5. Education ===
     edu_start = None
     for i, p in enumerate(doc.paragraphs):
@@ -555,6 +589,8 @@ def apply_ATS_template(template_bytes, data):
                 for run in new_p.runs:
                     run.font.size = Pt(10)
 
+    _lap("education")
+
     # === 6. Work Experience – delete old, add new with exact same style ===
     exp_start_idx = None
     for i, p in enumerate(doc.paragraphs):
@@ -608,24 +644,34 @@ def apply_ATS_template(template_bytes, data):
                 for run in bullet_para.runs:
                     run.font.size = Pt(10)
 
+    _lap("experience")
+
     # Save
     out = io.BytesIO()
     doc.save(out)
     out.seek(0)
+    _lap("save")
     return out.getvalue()
 
-def generate_resume(candidate_resume_file):
+def _build_resume(candidate_resume_file, timings):
+    start = time.perf_counter()
     raw_text = read_any_resume(candidate_resume_file)
+    timings["read"] = time.perf_counter() - start
+
+    start = time.perf_counter()
     data = extract_with_llama70b(raw_text)
+    timings["extract"] = time.perf_counter() - start
 
     # If summary is empty, generate one based on the resume content
     if not data.get("summary") or not str(data.get("summary", "")).strip():
+        start = time.perf_counter()
         generated_summary = generate_summary_from_resume(
             raw_text,
             data.get("experience", []),
             data.get("education", []),
             data.get("skills", "")
         )
+        timings["generate_summary"] = time.perf_counter() - start
         if generated_summary:
             data["summary"] = generated_summary
 
@@ -633,7 +679,48 @@ def generate_resume(candidate_resume_file):
     with open("main_resume.docx", "rb") as f:
         template_bytes = f.read()
 
-    new_docx_bytes = apply_ATS_template(template_bytes, data)
+    new_docx_bytes = apply_ATS_template(template_bytes, data, timings)
+    return new_docx_bytes, data
+
+def _write_profile_report(base_path, profiler, snapshot, timings):
+    """Dump the cProfile stats, top allocations and section timings next to the output."""
+    import json
+
+    prof_path = base_path + ".prof"
+    profiler.dump_stats(prof_path)
+
+    alloc_path = base_path + ".alloc.txt"
+    with open(alloc_path, "w", encoding="utf-8") as f:
+        f.write(f"Top {PROFILE_TOP_N} allocations by line\n")
+        for stat in snapshot.statistics("lineno")[:PROFILE_TOP_N]:
+            f.write(f"{stat}\n")
+
+    timings_path = base_path + ".timings.json"
+    with open(timings_path, "w", encoding="utf-8") as f:
+        json.dump({k: round(v, 6) for k, v in timings.items()}, f, indent=2)
+
+    return [prof_path, alloc_path, timings_path]
+
+def generate_resume(candidate_resume_file, profile=False):
+    profile = profile or PROFILE_ENABLED
+    timings = {}
+
+    if profile:
+        # Don't clobber a tracemalloc session someone else already started
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            new_docx_bytes, data = _build_resume(candidate_resume_file, timings)
+        finally:
+            profiler.disable()
+            snapshot = tracemalloc.take_snapshot()
+            if started_tracing:
+                tracemalloc.stop()
+    else:
+        new_docx_bytes, data = _build_resume(candidate_resume_file, timings)
 
     # Gradio's File output expects a path-like, not raw bytes.
     # Write the generated DOCX to a temporary file and return its path.
@@ -641,6 +728,10 @@ def generate_resume(candidate_resume_file):
         tmp.write(new_docx_bytes)
         tmp_path = tmp.name
 
+    if profile:
+        reports = _write_profile_report(os.path.splitext(tmp_path)[0], profiler, snapshot, timings)
+        print("Profiling reports written:\n  " + "\n  ".join(reports))
+
     return tmp_path, data
 
 # ========================== GRADIO UI ==========================
@@ -654,6 +745,10 @@ with gr.Blocks(title="ATS-Style Resume Cloner") as demo:
     out_docx = gr.File(label="Your new perfect resume.docx")
     out_json = gr.JSON(label="Extracted data (for checking)")
 
-    btn.click(generate_resume, inputs=candidate, outputs=[out_docx, out_json])
+    # Hidden toggle for capturing a cProfile/tracemalloc report of one request
+    with gr.Accordion("Advanced", open=False):
+        profile_toggle = gr.Checkbox(label="Profile this request", value=PROFILE_ENABLED)
+
+    btn.click(generate_resume, inputs=[candidate, profile_toggle], outputs=[out_docx, out_json])
 
 demo.launch(share=False)
\ No newline at end of file